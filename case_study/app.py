@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, Query, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Dict, Any
 from src.utils.logger import setup_logging, get_logger
@@ -6,7 +6,10 @@ from tenacity import retry, stop_after_attempt, wait_fixed, RetryError
 import httpx
 from threading import Thread
 from src.jobs import run_campground_job, run_db_get_campgrounds, run_db_get_campground_by_id
+from src.database import init_db, dispose_engines, get_read_db, SessionLocal
 from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+from sqlalchemy.orm import Session
 import asyncio
 import uuid
 
@@ -15,6 +18,14 @@ logger = get_logger(__name__)
 job_status = {} 
 URL = "https://thedyrt.com/api/v6/locations/search-results"
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    logger.info("API startup completed")
+    yield
+    dispose_engines()
+    logger.info("API shutdown completed")
+
 app = FastAPI(
     title="The Dyrt API Wrapper",
     description="""
@@ -35,6 +46,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -95,9 +107,9 @@ async def get_campgrounds(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @app.get("/db-campgrounds", response_model=Dict[str, Any], tags=["Database"] ,summary="Get campgrounds from local database", description="Get campgrounds from the local database with pagination.")
-async def get_campgrounds(limit: int = Query(10, ge=1, le=100), offset: int = Query(0, ge=0)):
+def get_campgrounds(limit: int = Query(10, ge=1, le=100), offset: int = Query(0, ge=0), db: Session = Depends(get_read_db)):
     try:
-        campgrounds = await run_db_get_campgrounds(limit=limit, offset=offset)
+        campgrounds = run_db_get_campgrounds(db, limit=limit, offset=offset)
         if not campgrounds:
             return JSONResponse(content={"message": "No campgrounds found"}, status_code=404)
         
@@ -135,9 +147,9 @@ async def get_campgrounds(limit: int = Query(10, ge=1, le=100), offset: int = Qu
         return JSONResponse(content={"error": str(e)}, status_code=500)
     
 @app.get("/db-campgrounds/{campground_id}", tags=["Database"], response_model=Dict[str, Any], summary="Get specific campground by ID", description="Get a specific campground from the local database by its ID.")
-async def get_campgrounds_by_id(campground_id: str):
+def get_campgrounds_by_id(campground_id: str, db: Session = Depends(get_read_db)):
     try:
-        campground = await run_db_get_campground_by_id(campground_id)
+        campground = run_db_get_campground_by_id(db, campground_id)
         if not campground:
             return JSONResponse(content={"message": "No campground found"}, status_code=404)
         
@@ -176,14 +188,16 @@ async def get_campgrounds_by_id(campground_id: str):
 def run_async_job(batch_id: str):
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
+    db = SessionLocal()
     try:
-        result = loop.run_until_complete(run_campground_job())
+        result = loop.run_until_complete(run_campground_job(db))
         job_status[batch_id]["status"] = "completed"
         job_status[batch_id]["result"] = result
     except Exception as e:
         job_status[batch_id]["status"] = "failed"
         job_status[batch_id]["result"] = str(e)
     finally:
+        db.close()
         loop.close()
 
 @app.get("/job-status/{batch_id}",  tags=["Scraper"], response_model=Dict[str, Any], summary="Get job status", description="Get the status of a running job by its batch ID.")
@@ -1,7 +1,8 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from sqlalchemy.orm import Session
 from src.utils.logger import get_logger
 from src.models import Campground
-from src.repositories.campground_repository import CampgroundRepository
+from src.repositories.campground_repository import CampgroundRepository, INSERTED, UPDATED
 from src.database import engine, SessionLocal
 from src.models.model import Base
 import asyncio
@@ -16,16 +17,19 @@ BASE_URL = "https://thedyrt.com/api/v6/locations/search-results"
 
 class DyrtConnector:
 
-    def __init__(self):
+    def __init__(self, db: Optional[Session] = None):
         self.base_url = BASE_URL
-        logger.info(f"API Connector initialized with base URL: {self.base_url}")
-        Base.metadata.create_all(bind=engine)
-        self.db = SessionLocal()
+        self.owns_db = db is None
+        if self.owns_db:
+            logger.info(f"API Connector initialized with base URL: {self.base_url}")
+            Base.metadata.create_all(bind=engine)
+            db = SessionLocal()
+            logger.info("Database connection and repository initialized")
+        self.db = db
         self.repo = CampgroundRepository(self.db)
-        logger.info("Database connection and repository initialized")
 
     def __del__(self):
-        if hasattr(self, 'db'):
+        if hasattr(self, 'db') and self.owns_db:
             self.db.close()
             logger.info("Database connection closed")
 
@@ -55,49 +59,51 @@ class DyrtConnector:
     async def get_all_campgrounds(self):
         bboxes = self.generate_bboxes()
         semaphore = asyncio.Semaphore(5)  
-        initial_count = self.repo.count_all()
-        total_saved = 0
+        seen_ids = set()
+        total_added = 0
+        total_updated = 0
+        total_unchanged = 0
+        total_duplicates = 0
         total_errors = 0
+        result_summary = {"status": "failed"}
         async with httpx.AsyncClient() as client:
             try:
                 async def limited_fetch(bbox):
                     async with semaphore:
                         try:
                             data = await self.fetch_page(client, 1, bbox)
-                            saved, errors = await self.validate_api_response_and_save_db(data)
-                            return saved, errors
+                            return await self.validate_api_response_and_save_db(data, seen_ids)
                         except Exception as e:
                             logger.error(f"Page {1} error: {e}")
-                            return 0, 1
+                            return 0, 0, 0, 0, 1
 
                 tasks = [limited_fetch(bbox) for bbox in bboxes]
                 results = await asyncio.gather(*tasks)
 
-                for saved, errors in results:
-                    total_saved += saved
+                for added, updated, unchanged, duplicates, errors in results:
+                    total_added += added
+                    total_updated += updated
+                    total_unchanged += unchanged
+                    total_duplicates += duplicates
                     total_errors += errors
 
-                db_count_campground = self.repo.count_all()
-                new_added = max(db_count_campground - initial_count, 0)
-                updated = max(total_saved - new_added, 0)
+                total_saved = total_added + total_updated
 
                 result_summary = {
                     "total_saved": total_saved,
                     "total_errors": total_errors,
-                    "db_old_count_campground": initial_count,
-                    "db_count_campground": db_count_campground,
-                    "new_added": new_added,
-                    "updated": updated,
+                    "duplicates_skipped": total_duplicates,
+                    "new_added": total_added,
+                    "updated": total_updated,
+                    "unchanged": total_unchanged,
                     "status": "success"
                 }
 
-                logger.info(f"✅ Total {total_saved} campground saved, {total_errors} errors occurred.")
-                if db_count_campground == initial_count:
+                logger.info(f"✅ Total {total_saved} campground saved, {total_errors} errors occurred, {total_duplicates} duplicates skipped.")
+                if total_added == 0 and total_updated == 0:
                     logger.info("🟡 No changes detected in the database. All records are up to date.")
-                elif db_count_campground > initial_count:
-                    logger.info(f"🆕 {new_added} new campgrounds added, ♻️ {updated} campgrounds updated.")
                 else:
-                    logger.warning(f"⚠️ Total campground count has decreased! Initial: {initial_count}, Final DB count campground: {db_count_campground}")
+                    logger.info(f"🆕 {total_added} new campgrounds added, ♻️ {total_updated} campgrounds updated, {total_unchanged} unchanged.")
 
             except Exception as e:
                 logger.error(f"Failed to fetch: {e}")
@@ -111,19 +117,30 @@ class DyrtConnector:
             for lng in range(min_lng, max_lng)
         ]
 
-    async def validate_api_response_and_save_db(self, data):
-        saved_count = 0
+    async def validate_api_response_and_save_db(self, data, seen_ids: set = None):
+        added_count = 0
+        updated_count = 0
+        unchanged_count = 0
+        duplicate_count = 0
         error_count = 0
+        if seen_ids is None:
+            seen_ids = set()
 
         if not data or 'data' not in data:
             logger.error("API response is empty or invalid")
-            return
+            return added_count, updated_count, unchanged_count, duplicate_count, 1
         
         logger.info(f"API count {len(data['data'])} items")
         
         for item in data['data']:
+            camp_id = item.get('id')
+            # Overlapping bboxes return the same campground more than once; mark it seen
+            # before saving so a failing item is not retried and re-counted in every cell
+            if camp_id in seen_ids:
+                duplicate_count += 1
+                continue
+            seen_ids.add(camp_id)
             try:
-                camp_id = item.get('id')
                 camp_type = item.get('type')
                 camp_links = item.get('links', {})
                 camp_attrs = item.get('attributes', {})
@@ -148,15 +165,20 @@ class DyrtConnector:
                 }
                 
                 campground = Campground(**campground_data)
-                self.repo.save_campground(campground)
-                saved_count += 1
+                outcome = self.repo.save_campground(campground)
+                if outcome == INSERTED:
+                    added_count += 1
+                elif outcome == UPDATED:
+                    updated_count += 1
+                else:
+                    unchanged_count += 1
                 
             except Exception as e:
                 error_count += 1
                 logger.error(f"Camping process error - ID: {item.get('id', 'unknown')}, Error: {str(e)}", exc_info=True)
 
-        logger.info(f"Total {saved_count} camping saved, {error_count} errors occurred.")
-        return saved_count, error_count
+        logger.info(f"Total {added_count} camping added, {updated_count} updated, {unchanged_count} unchanged, {duplicate_count} duplicates skipped, {error_count} errors occurred.")
+        return added_count, updated_count, unchanged_count, duplicate_count, error_count
 
     async def get_address_from_coordinates_async(self, lat, lon):
         geolocator = Nominatim(user_agent="campground_app")
@@ -169,7 +191,7 @@ class DyrtConnector:
             logger.error(f"Geopy hata: {e}")
             return None
 
-    async def get_campground_by_id(self, campground_id: str):
+    def get_campground_by_id(self, campground_id: str):
         try:
             campground = self.repo.get_by_id(campground_id)
             return campground
@@ -177,7 +199,7 @@ class DyrtConnector:
             logger.error(f"Error fetching campgrounds from DB: {str(e)}")
             return []
 
-    async def get_campgrounds_db(self, limit: int = 10, offset: int = 0):
+    def get_campgrounds_db(self, limit: int = 10, offset: int = 0):
         try:
             campgrounds = self.repo.get_all(limit=limit, offset=offset)
             return campgrounds
@@ -185,7 +207,7 @@ class DyrtConnector:
             logger.error(f"Error fetching campgrounds from DB: {str(e)}")
             return []
 
-    async def get_campgrounds_count(self):
+    def get_campgrounds_count(self):
         try:
             count = self.repo.count_all()
             return count
@@ -2,13 +2,49 @@ from sqlalchemy import create_engine
 import os
 from sqlalchemy.orm import sessionmaker
 from src.utils.logger import get_logger
-from sqlalchemy.ext.declarative import declarative_base
+from src.models.model import Base
 
 logger = get_logger(__name__)
 
 DATABASE_URL = os.environ.get("DB_URL")
+READ_DATABASE_URL = os.environ.get("DB_READ_URL") or DATABASE_URL
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 10))
+MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 20))
+POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+
+def build_engine(url: str):
+    return create_engine(
+        url,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
 
 logger.info(f"Connecting to database: {DATABASE_URL}")
-engine = create_engine(DATABASE_URL)
+engine = build_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
\ No newline at end of file
+
+if READ_DATABASE_URL != DATABASE_URL:
+    logger.info(f"Connecting to read replica: {READ_DATABASE_URL}")
+    read_engine = build_engine(READ_DATABASE_URL)
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+def init_db():
+    Base.metadata.create_all(bind=engine)
+    logger.info("Database schema initialized")
+
+def dispose_engines():
+    engine.dispose()
+    if read_engine is not engine:
+        read_engine.dispose()
+    logger.info("Database engines disposed")
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
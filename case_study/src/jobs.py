@@ -1,24 +1,26 @@
+from typing import Optional
+from sqlalchemy.orm import Session
 from src.connector.dyrt_connector import DyrtConnector
 from src.utils.logger import get_logger
 
 
-async def run_campground_job():
-    connector = DyrtConnector()
+async def run_campground_job(db: Optional[Session] = None):
+    connector = DyrtConnector(db)
     result = await connector.get_all_campgrounds()
     logger = get_logger(__name__)
     logger.info(f"Job completed with result: {result}")
     return result
 
-async def run_db_get_campgrounds(limit: int = 10, offset: int = 0):
-    connector = DyrtConnector()
-    result = await connector.get_campgrounds_db(limit=limit, offset=offset)
+def run_db_get_campgrounds(db: Session, limit: int = 10, offset: int = 0):
+    connector = DyrtConnector(db)
+    result = connector.get_campgrounds_db(limit=limit, offset=offset)
     logger = get_logger(__name__)
     logger.info(f"Job completed with result: {result}")
     return result
 
-async def run_db_get_campground_by_id(campground_id: str):
-    connector = DyrtConnector()
-    result = await connector.get_campground_by_id(campground_id)
+def run_db_get_campground_by_id(db: Session, campground_id: str):
+    connector = DyrtConnector(db)
+    result = connector.get_campground_by_id(campground_id)
     logger = get_logger(__name__)
     logger.info(f"Job completed with result: {result}")
     return result
@@ -1,11 +1,16 @@
+from sqlalchemy import JSON, cast, literal_column, or_
 from sqlalchemy.orm import Session
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.dialects.postgresql import JSONB, insert
 from src.models import CampgroundDB, Campground
 from src.utils.logger import get_logger
 
 
 logger = get_logger(__name__)
 
+INSERTED = "inserted"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
 class CampgroundRepository:
     
     def __init__(self, db: Session):
@@ -47,21 +52,28 @@ class CampgroundRepository:
                 'raw_data': raw_json
             }
             
-            existing = self.db.query(CampgroundDB).filter(CampgroundDB.id == campground.id).first()
-            if existing:
-                stmt = insert(CampgroundDB).values(**values)
-                
-                update_values = {k: v for k, v in values.items() if k != 'id'}
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=['id'],
-                    set_=update_values
-                )
-                self.db.execute(stmt)
-            else:
-                db_camp = CampgroundDB(**values)
-                self.db.add(db_camp)
+            update_values = {k: v for k, v in values.items() if k != 'id'}
+            stmt = insert(CampgroundDB).values(**values)
+            # Only rewrite rows whose stored values differ; JSON has no equality operator so compare as jsonb
+            changed = or_(*[
+                cast(CampgroundDB.__table__.c[k], JSONB).is_distinct_from(cast(stmt.excluded[k], JSONB))
+                if isinstance(CampgroundDB.__table__.c[k].type, JSON)
+                else CampgroundDB.__table__.c[k].is_distinct_from(stmt.excluded[k])
+                for k in update_values
+            ])
+            # xmax is 0 only for freshly inserted rows, so RETURNING tells insert from update;
+            # an unchanged row is skipped by the WHERE clause and returns nothing
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['id'],
+                set_=update_values,
+                where=changed
+            ).returning(literal_column("xmax = 0").label("inserted"))
+            inserted = self.db.execute(stmt).scalar()
             
             self.db.commit()
+            if inserted is None:
+                return UNCHANGED
+            return INSERTED if inserted else UPDATED
             
         except Exception as e:
             self.db.rollback()